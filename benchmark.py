@@ -0,0 +1,25 @@
+import sys
+import time
+
+from recommendation import RecommendationSystem
+
+
+def run_benchmark(csv_data_file: str, queries: list, repeat: int = 5):
+    start = time.perf_counter()
+    recommendation_system = RecommendationSystem(csv_data_file)
+    load_seconds = time.perf_counter() - start
+    print("load:", round(load_seconds * 1000, 1), "ms,", len(recommendation_system.tags_dataset.video_glossary),
+          "videos,", len(recommendation_system.tags_dataset.tag_vector_map), "tags")
+
+    for query in queries:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            recommendations = recommendation_system.get_video_recommendations(query)
+        query_seconds = (time.perf_counter() - start) / repeat
+        print("query:", repr(query), round(query_seconds * 1000, 2), "ms,", len(recommendations), "results")
+
+
+if __name__ == "__main__":
+    # EMBEDDING_BACKEND=hashed python benchmark.py data/data-short.csv
+    csv_file = sys.argv[1] if len(sys.argv) > 1 else 'data/data.csv'
+    run_benchmark(csv_file, ["abs workout", "bigger arms, chest", "yoga for seniors"])
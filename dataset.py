@@ -3,6 +3,7 @@ from numpy import ndarray
 import sqlite3 as sql
 from typing import Dict, List
 
+from memory_report import MemoryProfiler, StructureSizer
 from tokenizer import Tokenizer, TokenizerHelper
 
 
@@ -216,10 +217,18 @@ class TagsDataset:
                         multi_word_token_text_array.append(token.text)
                         multi_word_token_vector_list.append(token.vector)
 
-    def load_data(self):
-        self._populate_video_glossary('data/data.csv')
+    def load_data(self, csv_data_file: str = 'data/data.csv', memory_profiler: MemoryProfiler = None):
+        if memory_profiler and not memory_profiler.is_started():
+            memory_profiler.start()
+
+        self._populate_video_glossary(csv_data_file)
+        if memory_profiler:
+            memory_profiler.take_snapshot("video_glossary", StructureSizer.video_glossary(self.video_glossary))
+
         self._populate_tags_data()
-        pass
+        if memory_profiler:
+            memory_profiler.take_snapshot("tags_data", StructureSizer.tag_maps(self.tag_vector_map,
+                                                                               self.tag_video_map))
 
 
 
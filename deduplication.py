@@ -0,0 +1,150 @@
+import logging
+from typing import Dict, List, Set
+
+import numpy as np
+from numpy import ndarray
+
+logger = logging.getLogger(__name__)
+
+
+class DuplicateClusters:
+    """
+    Groups near-duplicate videos (re-uploads, near-identical titles and tags) and picks one canonical
+    representative per group. Candidate pairs come from random hyperplane hashing of the title and tag vectors,
+    so only videos sharing a bucket are compared instead of all pairs.
+
+    Averaged word vectors of short titles, and sums of many tag vectors, all lean towards the same common
+    direction, so the catalog mean is subtracted before hashing and comparing. A candidate pair is merged only if
+    it also passes two exact checks: the title token sets must overlap (Jaccard) and the durations must agree.
+    """
+    def __init__(self, title_threshold: float = 0.95, tags_threshold: float = 0.95,
+                 title_jaccard_threshold: float = 0.8, duration_tolerance: float = 0.05,
+                 num_tables: int = 4, num_bits: int = 16, max_bucket_size: int = 50, seed: int = 0):
+        self.title_threshold = title_threshold
+        self.tags_threshold = tags_threshold
+        self.title_jaccard_threshold = title_jaccard_threshold
+        self.duration_tolerance = duration_tolerance
+        self.num_tables = num_tables
+        self.num_bits = num_bits
+        self.max_bucket_size = max_bucket_size
+        self.seed = seed
+        self.canonical_video_map: Dict[int, int] = {}      # video id - canonical video id
+        self.cluster_map: Dict[int, List[int]] = {}        # canonical video id - list of video id in the cluster
+        self.stats: Dict[str, int] = {}
+
+    @staticmethod
+    def _center_and_normalize_rows(vectors: ndarray):
+        vectors = vectors - vectors.mean(axis=0)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _get_candidate_pairs(self, vectors: ndarray, title_tokens: List[Set[str]]):
+        planes = np.random.RandomState(self.seed).standard_normal((self.num_tables * self.num_bits,
+                                                                   vectors.shape[1]))
+        bits = (vectors @ planes.T > 0).reshape(len(vectors), self.num_tables, self.num_bits)
+        codes = bits @ (1 << np.arange(self.num_bits))
+
+        candidate_pairs = set()
+        split_buckets = 0
+        for table in range(self.num_tables):
+            buckets: Dict[int, List[int]] = {}
+            for row, code in enumerate(codes[:, table]):
+                buckets.setdefault(int(code), []).append(row)
+
+            for rows in buckets.values():
+                if len(rows) <= self.max_bucket_size:
+                    for i in range(len(rows)):
+                        for j in range(i + 1, len(rows)):
+                            candidate_pairs.add((rows[i], rows[j]))
+                    continue
+
+                # comparing a bucket this large would be all-pairs; it is usually a block of exact re-uploads,
+                # so split it by exact title tokens and compare every row with the first row of its split
+                split_buckets += 1
+                representatives: Dict[tuple, int] = {}
+                for row in rows:
+                    title_key = tuple(sorted(title_tokens[row]))
+                    if title_key in representatives:
+                        candidate_pairs.add((representatives[title_key], row))
+                    else:
+                        representatives[title_key] = row
+
+        if split_buckets > 0:
+            logger.info("Split %d hash buckets larger than %d videos by exact title tokens",
+                        split_buckets, self.max_bucket_size)
+        self.stats["split_buckets"] = split_buckets
+        return candidate_pairs
+
+    @staticmethod
+    def _get_similarity(vectors: ndarray, row1: int, row2: int):
+        # a row equal to the catalog mean is zero after centering; two of them are still the same vector
+        if not vectors[row1].any() and not vectors[row2].any():
+            return 1.0
+        return vectors[row1] @ vectors[row2]
+
+    def _is_same_duration(self, duration1: int, duration2: int):
+        if duration1 < 0 or duration2 < 0:
+            return True
+        return abs(duration1 - duration2) <= self.duration_tolerance * max(duration1, duration2)
+
+    def build(self, video_ids: List[int], title_vectors: ndarray, tag_vectors: ndarray,
+              title_tokens: List[Set[str]], durations: List[int], num_views: List[int]):
+        self.canonical_video_map = {}
+        self.cluster_map = {}
+        self.stats = {}
+        if len(video_ids) == 0:
+            return
+
+        title_vectors = self._center_and_normalize_rows(title_vectors)
+        tag_vectors = self._center_and_normalize_rows(tag_vectors)
+
+        parent = list(range(len(video_ids)))
+
+        def find(row: int):
+            while parent[row] != row:
+                parent[row] = parent[parent[row]]
+                row = parent[row]
+            return row
+
+        candidate_pairs = self._get_candidate_pairs(np.hstack([title_vectors, tag_vectors]), title_tokens)
+        merged_pairs = 0
+        for i, j in candidate_pairs:
+            if not self._is_same_duration(durations[i], durations[j]):
+                continue
+            union_size = len(title_tokens[i] | title_tokens[j])
+            if union_size == 0 or len(title_tokens[i] & title_tokens[j]) / union_size < self.title_jaccard_threshold:
+                continue
+            if self._get_similarity(title_vectors, i, j) < self.title_threshold:
+                continue
+            if self._get_similarity(tag_vectors, i, j) < self.tags_threshold:
+                continue
+            parent[find(i)] = find(j)
+            merged_pairs += 1
+
+        clusters: Dict[int, List[int]] = {}
+        for row in range(len(video_ids)):
+            clusters.setdefault(find(row), []).append(row)
+
+        for rows in clusters.values():
+            # most viewed video represents the cluster
+            canonical_row = max(rows, key=lambda r: (num_views[r], -video_ids[r]))
+            canonical_video_id = video_ids[canonical_row]
+            self.cluster_map[canonical_video_id] = [video_ids[row] for row in rows]
+            for row in rows:
+                self.canonical_video_map[video_ids[row]] = canonical_video_id
+
+        self.stats["videos"] = len(video_ids)
+        self.stats["candidate_pairs"] = len(candidate_pairs)
+        self.stats["merged_pairs"] = merged_pairs
+        self.stats["clusters"] = len(self.cluster_map)
+        self.stats["largest_cluster"] = max(len(members) for members in self.cluster_map.values())
+
+    def get_canonical_video_id(self, video_id: int):
+        return self.canonical_video_map.get(video_id, video_id)
+
+    def is_canonical(self, video_id: int):
+        return self.get_canonical_video_id(video_id) == video_id
+
+    def get_cluster(self, video_id: int):
+        return self.cluster_map.get(self.get_canonical_video_id(video_id), [video_id])
@@ -0,0 +1,206 @@
+import csv
+import hashlib
+import os
+import re
+from typing import Dict, List, Set
+
+import numpy as np
+from numpy import ndarray
+
+
+class EmbeddingBackend:
+    """
+    Interface used by Tokenizer. Documents and tokens returned by a backend follow spaCy's shape:
+    a document is an iterable of tokens and has a vector; a token has text, lemma_, is_oov, like_num and vector.
+    """
+    vector_size: int = 0
+
+    def parse(self, text: str):
+        """Runs the full pipeline on text"""
+        raise NotImplementedError
+
+    def lemmatize(self, text: str):
+        """Runs only what is needed to get lemmas"""
+        raise NotImplementedError
+
+    def make_doc(self, text: str):
+        """Runs only the tokenizer"""
+        raise NotImplementedError
+
+    def get_vectors(self, words: List[str]) -> ndarray:
+        """Returns one row per word, words without a vector get a row of zeros"""
+        raise NotImplementedError
+
+
+class SpacyBackend(EmbeddingBackend):
+    def __init__(self, model_name: str = 'en_core_web_lg', nlp=None):
+        if nlp is None:
+            import spacy
+            nlp = spacy.load(model_name)
+
+        self.nlp = nlp
+        self.vector_size = self.nlp.vocab.vectors_length
+        self.lemmatize_disabled_pipes = [name for name in ("parser", "ner") if name in self.nlp.pipe_names]
+
+    def parse(self, text: str):
+        return self.nlp(text)
+
+    def lemmatize(self, text: str):
+        return self.nlp(text, disable=self.lemmatize_disabled_pipes)
+
+    def make_doc(self, text: str):
+        return self.nlp.make_doc(text)
+
+    def get_vectors(self, words: List[str]) -> ndarray:
+        vectors = self.nlp.vocab.vectors
+        rows = vectors.find(keys=[self.nlp.vocab.strings[word] for word in words])
+        result = np.zeros((len(words), self.vector_size), dtype=np.float32)
+        found = rows >= 0
+        result[found] = vectors.data[rows[found]]
+        return result
+
+
+class HashedToken:
+    def __init__(self, backend: 'HashedBackend', text: str, lemma: str):
+        self._backend = backend
+        self.text = text
+        self.lemma_ = lemma
+        self.is_oov = not backend.has_vector(text)
+        self.like_num = HashedBackend.is_number(text)
+
+    @property
+    def vector(self) -> ndarray:
+        if self.is_oov:
+            return np.zeros(HashedBackend.vector_size, dtype=np.float32)
+        return self._backend.get_word_vector(self.text)
+
+    def __len__(self):
+        return len(self.text)
+
+    def __str__(self):
+        return self.text
+
+
+class HashedDocument(list):
+    @property
+    def vector(self) -> ndarray:
+        if len(self) == 0:
+            return np.zeros(HashedBackend.vector_size, dtype=np.float32)
+        return np.mean([token.vector for token in self], axis=0)
+
+
+class HashedBackend(EmbeddingBackend):
+    """
+    Deterministic stand-in for the spaCy model, meant for tests and benchmarks on machines without the model.
+    Word vectors are the sum of hashed character trigram vectors, so words sharing most of their spelling
+    (workout / workouts) end up close to each other. Lemmas come from a few suffix rules.
+    Like spaCy, only words in the vocabulary have a vector; the others are out of vocabulary and get zeros.
+    Without a vocabulary every word has a vector.
+    """
+    vector_size = 300
+
+    _token_pattern = re.compile(r"\d+(?:\.\d+)?|\w+|[^\w\s]")
+    _lemma_exceptions = {
+        "is": "be", "are": "be", "was": "be", "were": "be", "been": "be", "am": "be",
+        "has": "have", "had": "have", "does": "do", "did": "do", "done": "do",
+        "women": "woman", "men": "man", "feet": "foot", "teeth": "tooth", "children": "child",
+        "better": "good", "best": "good", "lost": "lose", "ran": "run"
+    }
+
+    def __init__(self, vocabulary: Set[str] = None):
+        self.vocabulary = vocabulary
+        self._vector_cache: Dict[str, ndarray] = {}
+        self._ngram_cache: Dict[str, ndarray] = {}
+
+    @classmethod
+    def from_csv(cls, csv_data_file: str):
+        """
+        Builds the vocabulary from the titles and tags of a data file, with the lemmas of those words
+        """
+        words = {","}
+        with open(csv_data_file, newline='', encoding='utf-8') as csv_file:
+            csv_reader = csv.reader(csv_file)
+            next(csv_reader)
+            for row in csv_reader:
+                words.update(cls._token_pattern.findall((row[1] + " " + row[3]).lower()))
+
+        vocabulary = set(words)
+        for word in words:
+            lemma = cls.get_lemma(word)
+            vocabulary.add(lemma)
+            vocabulary.add(lemma.replace('abs', 'ab'))
+        return cls(vocabulary)
+
+    def has_vector(self, word: str) -> bool:
+        return self.vocabulary is None or word in self.vocabulary
+
+    @staticmethod
+    def is_number(text: str) -> bool:
+        try:
+            float(text)
+            return True
+        except ValueError:
+            return False
+
+    @classmethod
+    def get_lemma(cls, word: str) -> str:
+        if word in cls._lemma_exceptions:
+            return cls._lemma_exceptions[word]
+
+        if len(word) <= 3 or not word.isalpha():
+            return word
+
+        if word.endswith("ies") and len(word) > 4:
+            return word[:-3] + "y"
+        if word.endswith(("sses", "shes", "ches", "xes")):
+            return word[:-2]
+        if word.endswith("s") and not word.endswith(("ss", "us", "is")):
+            return word[:-1]
+        if word.endswith("ing") and len(word) > 5:
+            stem = word[:-3]
+            if len(stem) > 2 and stem[-1] == stem[-2] and stem[-1] not in "lsz":
+                return stem[:-1]
+            return stem
+        return word
+
+    def _get_ngram_vector(self, ngram: str) -> ndarray:
+        if ngram not in self._ngram_cache:
+            seed = int.from_bytes(hashlib.blake2b(ngram.encode('utf-8'), digest_size=4).digest(), 'little')
+            self._ngram_cache[ngram] = np.random.RandomState(seed).standard_normal(self.vector_size).astype(
+                np.float32)
+        return self._ngram_cache[ngram]
+
+    def get_word_vector(self, word: str) -> ndarray:
+        if word not in self._vector_cache:
+            padded_word = "<" + word + ">"
+            ngrams = [padded_word[i:i + 3] for i in range(max(len(padded_word) - 2, 1))]
+            vec = self._get_ngram_vector(padded_word)
+            for ngram in ngrams:
+                vec = vec + self._get_ngram_vector(ngram)
+            self._vector_cache[word] = vec / len(ngrams)
+        return self._vector_cache[word]
+
+    def make_doc(self, text: str) -> HashedDocument:
+        return HashedDocument(HashedToken(self, word, word) for word in self._token_pattern.findall(text))
+
+    def parse(self, text: str) -> HashedDocument:
+        return self.lemmatize(text)
+
+    def lemmatize(self, text: str) -> HashedDocument:
+        return HashedDocument(HashedToken(self, word, self.get_lemma(word.lower()))
+                              for word in self._token_pattern.findall(text))
+
+    def get_vectors(self, words: List[str]) -> ndarray:
+        result = np.zeros((len(words), self.vector_size), dtype=np.float32)
+        for i, word in enumerate(words):
+            if self.has_vector(word):
+                result[i] = self.get_word_vector(word)
+        return result
+
+
+def get_embedding_backend(name: str) -> EmbeddingBackend:
+    if name == 'spacy':
+        return SpacyBackend()
+    if name == 'hashed':
+        return HashedBackend.from_csv(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'data.csv'))
+    raise ValueError("Unknown embedding backend: " + name)
@@ -0,0 +1,118 @@
+import logging
+import sqlite3 as sql
+import threading
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+from numpy import ndarray
+
+logger = logging.getLogger(__name__)
+
+
+class FeedbackLog:
+    """
+    Append-only log of user feedback events (clicks, watches) kept in a local SQLite file.
+    Events are buffered in memory and written in batches.
+    """
+    event_weights = {"click": 1.0, "watch": 2.0}
+
+    def __init__(self, db_file: str, batch_size: int = 50):
+        self.db_file = db_file
+        self.batch_size = batch_size
+        self._buffer: List[Tuple[str, str, float, float]] = []
+        self._lock = threading.Lock()
+
+        con = sql.connect(self.db_file)
+        con.execute("PRAGMA journal_mode=WAL")
+        con.execute("CREATE TABLE IF NOT EXISTS feedback ("
+                    "id INTEGER PRIMARY KEY AUTOINCREMENT, video_id TEXT NOT NULL, event TEXT NOT NULL, "
+                    "value REAL NOT NULL, created_on REAL NOT NULL)")
+        con.commit()
+        con.close()
+
+    def record(self, youtube_video_id: str, event: str, value: float = 1.0):
+        if event not in self.event_weights:
+            raise ValueError("Unknown feedback event: " + event)
+
+        with self._lock:
+            self._buffer.append((youtube_video_id, event, value, time.time()))
+            is_full = len(self._buffer) >= self.batch_size
+
+        if is_full:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            events = self._buffer
+            self._buffer = []
+
+        if len(events) == 0:
+            return
+
+        con = sql.connect(self.db_file)
+        con.executemany("INSERT INTO feedback (video_id, event, value, created_on) VALUES (?, ?, ?, ?)", events)
+        con.commit()
+        con.close()
+
+    def read_events(self, after_event_id: int):
+        con = sql.connect(self.db_file)
+        events = [[event_id, video_id, event, value]
+                  for event_id, video_id, event, value in
+                  con.execute("SELECT id, video_id, event, value FROM feedback WHERE id > ? ORDER BY id",
+                              (after_event_id,))]
+        con.close()
+        return events
+
+
+class FeedbackAggregator(threading.Thread):
+    """
+    Background thread that periodically folds new feedback events into a per-video boost array.
+    The array is indexed by Video.id, holds values in [0, 1] and is replaced as a whole on every update,
+    so readers just take the current reference and never wait on the aggregator or on SQLite.
+    A boost depends only on the video's own events and saturates at 1.0 once their weighted total
+    reaches saturation_total.
+    """
+    def __init__(self, feedback_log: FeedbackLog, video_id_map: Dict[str, int], num_videos: int,
+                 interval_seconds: float = 30.0, saturation_total: float = 50.0):
+        super(FeedbackAggregator, self).__init__(daemon=True)
+        self.feedback_log = feedback_log
+        self.video_id_map = video_id_map        # youtube video id - Video.id
+        self.interval_seconds = interval_seconds
+        self.saturation_total = saturation_total
+        self.boosts: ndarray = np.zeros(num_videos)
+
+        self._feedback_totals = np.zeros(num_videos)
+        self._last_event_id = 0
+        self._aggregate_lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+    def aggregate(self):
+        with self._aggregate_lock:
+            self.feedback_log.flush()
+            events = self.feedback_log.read_events(self._last_event_id)
+            if len(events) == 0:
+                return
+
+            for event_id, youtube_video_id, event, value in events:
+                self._last_event_id = event_id
+                video_id = self.video_id_map.get(youtube_video_id, -1)
+                if video_id < 0:
+                    continue
+                self._feedback_totals[video_id] += FeedbackLog.event_weights.get(event, 0.0) * value
+
+            boosts = np.log1p(np.maximum(self._feedback_totals, 0)) / np.log1p(self.saturation_total)
+            self.boosts = np.minimum(boosts, 1.0)
+
+    def run(self):
+        while not self._stop_event.wait(self.interval_seconds):
+            # a failed run (e.g. the database is locked) must not end the thread, the next run picks the events up
+            try:
+                self.aggregate()
+            except Exception:
+                logger.exception("Feedback aggregation failed")
+
+    def stop(self):
+        self._stop_event.set()
+        if self.is_alive():
+            self.join()
@@ -6,7 +6,6 @@ from numpy.linalg import norm
 # from tokenizer import Tokenizer
 # t = Tokenizer()
 # tokens = t.get_tokens('I bought twenty four apples in 2021')
-from universal import nlp_global_object
 
 # tags_text = "nodal officer"
 # doc = nlp_global_object(tags_text)
@@ -55,3 +54,4 @@ while True:
                 break
     print()
     print()
+spacy.close()
@@ -0,0 +1,171 @@
+import json
+import sys
+import tracemalloc
+from typing import Dict, List
+
+from numpy import ndarray
+
+
+class MemoryProfiler:
+    """
+    Diagnostic helper that takes a tracemalloc snapshot after each load phase and records how much memory
+    (and how many allocations) the phase added, along with an estimate of the size of the structures it built.
+    """
+    def __init__(self, top_n: int = 10):
+        self.top_n = top_n
+        self.phases: List[Dict] = []
+        self._previous_snapshot = None
+        self._started_tracing = False
+
+    def is_started(self):
+        return self._previous_snapshot is not None
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._previous_snapshot = self._take_filtered_snapshot()
+
+    @staticmethod
+    def _take_filtered_snapshot():
+        # leave out the profiler's own bookkeeping (stored snapshots) and lazy imports
+        return tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>")
+        ])
+
+    def stop(self):
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        self._previous_snapshot = None
+
+    def take_snapshot(self, phase: str, structures: Dict[str, Dict]):
+        if not self.is_started():
+            # a baseline taken now would already include the phase being measured
+            raise RuntimeError("MemoryProfiler.start() must be called before the phase '" + phase + "' runs")
+
+        snapshot = self._take_filtered_snapshot()
+        stats = snapshot.compare_to(self._previous_snapshot, 'filename')
+        current, peak = tracemalloc.get_traced_memory()
+
+        top_allocations = []
+        for stat in stats[:self.top_n]:
+            top_allocations.append({
+                "file": stat.traceback[0].filename,
+                "size_diff_bytes": stat.size_diff,
+                "count_diff": stat.count_diff
+            })
+
+        self.phases.append({
+            "phase": phase,
+            "size_diff_bytes": sum(stat.size_diff for stat in stats),
+            "count_diff": sum(stat.count_diff for stat in stats),
+            "traced_current_bytes": current,
+            "traced_peak_bytes": peak,
+            "structures": structures,
+            "top_allocations": top_allocations
+        })
+        self._previous_snapshot = snapshot
+
+    def get_report(self):
+        return {
+            "python_version": sys.version.split()[0],
+            "phases": self.phases
+        }
+
+    def write_report(self, json_file: str):
+        with open(json_file, 'w', encoding='utf-8') as file:
+            json.dump(self.get_report(), file, indent=2)
+
+
+class StructureSizer:
+    """
+    Shallow size estimates for the structures kept by TagsDataset and RecommendationSystem.
+    Shared interned objects are not de-duplicated, so these are upper bounds.
+    """
+    @staticmethod
+    def video_glossary(video_glossary: Dict) -> Dict[str, Dict]:
+        video_objects_bytes = sys.getsizeof(video_glossary) + sys.getsizeof(video_glossary._inverse)
+        tags_bytes = 0
+        titles_bytes = 0
+        for video_id in video_glossary:
+            video_obj = video_glossary[video_id]
+            video_objects_bytes += sys.getsizeof(video_obj) + sys.getsizeof(video_obj.__dict__)
+            tags_bytes += sys.getsizeof(video_obj.tags)
+            titles_bytes += sys.getsizeof(video_obj.title)
+
+        count = len(video_glossary)
+        return {
+            "video_objects": {"count": count, "bytes": video_objects_bytes},
+            "video_tags_strings": {"count": count, "bytes": tags_bytes},
+            "video_titles_strings": {"count": count, "bytes": titles_bytes}
+        }
+
+    @staticmethod
+    def tag_maps(tag_vector_map: Dict[int, ndarray], tag_video_map: Dict[int, List[int]]) -> Dict[str, Dict]:
+        vectors_bytes = sys.getsizeof(tag_vector_map)
+        for tag_id in tag_vector_map:
+            vector = tag_vector_map[tag_id]
+            vectors_bytes += sys.getsizeof(vector)
+            if isinstance(vector, ndarray) and vector.base is not None:
+                vectors_bytes += vector.nbytes
+
+        video_lists_bytes = sys.getsizeof(tag_video_map)
+        for tag_id in tag_video_map:
+            video_lists_bytes += sys.getsizeof(tag_video_map[tag_id])
+
+        return {
+            "tag_vectors": {"count": len(tag_vector_map), "bytes": vectors_bytes},
+            "tag_video_lists": {"count": len(tag_video_map), "bytes": video_lists_bytes}
+        }
+
+    @staticmethod
+    def title_documents(video_titles_token_repo: Dict[int, object]) -> Dict[str, Dict]:
+        # spaCy keeps token data in its own memory pool that getsizeof cannot see, so the serialized size
+        # (without the shared vocab) is used for spaCy documents
+        token_count = 0
+        documents_bytes = sys.getsizeof(video_titles_token_repo)
+        for video_id in video_titles_token_repo:
+            doc = video_titles_token_repo[video_id]
+            token_count += len(doc)
+            if hasattr(doc, "to_bytes"):
+                documents_bytes += len(doc.to_bytes(exclude=["vocab"]))
+            else:
+                documents_bytes += sys.getsizeof(doc) + sum(sys.getsizeof(token) + sys.getsizeof(token.__dict__)
+                                                             for token in doc)
+
+        return {
+            "title_documents": {"count": len(video_titles_token_repo), "tokens": token_count,
+                                "bytes": documents_bytes}
+        }
+
+    @staticmethod
+    def duplicate_clusters(duplicate_clusters, canonical_tag_video_map: Dict[int, List[int]]) -> Dict[str, Dict]:
+        cluster_bytes = sys.getsizeof(duplicate_clusters.canonical_video_map) + \
+            sys.getsizeof(duplicate_clusters.cluster_map)
+        for canonical_video_id in duplicate_clusters.cluster_map:
+            cluster_bytes += sys.getsizeof(duplicate_clusters.cluster_map[canonical_video_id])
+
+        video_lists_bytes = sys.getsizeof(canonical_tag_video_map)
+        for tag_id in canonical_tag_video_map:
+            video_lists_bytes += sys.getsizeof(canonical_tag_video_map[tag_id])
+
+        return {
+            "duplicate_clusters": {"count": len(duplicate_clusters.cluster_map), "bytes": cluster_bytes},
+            "canonical_tag_video_lists": {"count": len(canonical_tag_video_map), "bytes": video_lists_bytes}
+        }
+
+
+if __name__ == "__main__":
+    from recommendation import RecommendationSystem
+
+    report_file = sys.argv[1] if len(sys.argv) > 1 else 'memory_report.json'
+    csv_file = sys.argv[2] if len(sys.argv) > 2 else 'data/data.csv'
+    profiler = MemoryProfiler()
+    profiler.start()
+    RecommendationSystem(csv_file, memory_profiler=profiler)
+    profiler.stop()
+    profiler.write_report(report_file)
+    print("Memory report written to", report_file)
@@ -1,19 +1,72 @@
-from typing import Dict
+from typing import Dict, List, Tuple
+
+import numpy as np
+from numpy import ndarray
 
 from dataset import TagsDataset, Video
+from deduplication import DuplicateClusters
+from feedback import FeedbackAggregator, FeedbackLog
+from memory_report import MemoryProfiler, StructureSizer
 from tokenizer import Tokenizer
 from tokenizer import TokenizerHelper
 
 
 class RecommendationSystem:
-    def __init__(self):
+    def __init__(self, csv_data_file: str = 'data/data.csv', memory_profiler: MemoryProfiler = None,
+                 feedback_db_file: str = None):
+        if memory_profiler and not memory_profiler.is_started():
+            memory_profiler.start()
+
         self.tokenizer = Tokenizer()
         self.tags_dataset = TagsDataset()
         self.video_titles_token_repo: Dict[int, object] = {}
         self.max_results = 200
+        self.feedback_log: FeedbackLog = None
+        self.feedback_aggregator: FeedbackAggregator = None
+        self.duplicate_clusters = DuplicateClusters()
+        self.canonical_title_video_ids: List[int] = []      # video ids with a title document, duplicates left out
+        self.canonical_tag_video_map: Dict[int, List[int]] = {}     # tag id - list of canonical video id
 
-        self.tags_dataset.load_data()
+        self.tags_dataset.load_data(csv_data_file, memory_profiler)
         self._init_tokens_for_tags()
+        if memory_profiler:
+            memory_profiler.take_snapshot("video_title_documents",
+                                          StructureSizer.title_documents(self.video_titles_token_repo))
+
+        self._init_duplicate_clusters()
+        if memory_profiler:
+            memory_profiler.take_snapshot("duplicate_clusters",
+                                          StructureSizer.duplicate_clusters(self.duplicate_clusters,
+                                                                            self.canonical_tag_video_map))
+
+        if feedback_db_file:
+            self._init_feedback(feedback_db_file)
+
+    def _init_feedback(self, feedback_db_file: str):
+        video_glossary = self.tags_dataset.video_glossary
+        # feedback on a collapsed duplicate counts for its cluster's representative, the only one that gets scored
+        video_id_map = {
+            video_glossary[video_id].youtube_id:
+                video_glossary[self.duplicate_clusters.get_canonical_video_id(video_id)].id
+            for video_id in video_glossary
+        }
+        self.feedback_log = FeedbackLog(feedback_db_file)
+        self.feedback_aggregator = FeedbackAggregator(self.feedback_log, video_id_map, len(video_glossary))
+        self.feedback_aggregator.aggregate()
+        self.feedback_aggregator.start()
+
+    def record_feedback(self, youtube_video_id: str, event: str, value: float = 1.0):
+        if self.feedback_log:
+            self.feedback_log.record(youtube_video_id, event, value)
+
+    def close(self):
+        """
+        Stops the feedback aggregator and writes out buffered feedback events
+        """
+        if self.feedback_aggregator:
+            self.feedback_aggregator.stop()
+        if self.feedback_log:
+            self.feedback_log.flush()
 
     def _init_tokens_for_tags(self):
         for video_id in self.tags_dataset.video_glossary:
@@ -22,12 +75,53 @@ class RecommendationSystem:
             if doc:
                 self.video_titles_token_repo[video_id] = doc
 
-    def _get_video_recommendations_based_on_video_titles(self, input_docs):
+    def _init_duplicate_clusters(self):
+        video_glossary = self.tags_dataset.video_glossary
+        video_ids = list(self.video_titles_token_repo)
+        row_map = {video_id: row for row, video_id in enumerate(video_ids)}
+
+        title_vectors = np.array([self.video_titles_token_repo[video_id].vector for video_id in video_ids])
+        tag_vectors = np.zeros(title_vectors.shape)
+        for tag_id in self.tags_dataset.single_word_tag_glossary:
+            tag_vector = self.tags_dataset.tag_vector_map[tag_id]
+            for video_id in self.tags_dataset.tag_video_map[tag_id]:
+                if video_id in row_map:
+                    tag_vectors[row_map[video_id]] += tag_vector
+
+        title_tokens = [set(token.text for token in self.video_titles_token_repo[video_id]) for video_id in video_ids]
+        durations = [video_glossary[video_id].duration for video_id in video_ids]
+        num_views = [video_glossary[video_id].num_views for video_id in video_ids]
+        self.duplicate_clusters.build(video_ids, title_vectors, tag_vectors, title_tokens, durations, num_views)
+
+        self.canonical_title_video_ids = [video_id for video_id in video_ids
+                                          if self.duplicate_clusters.is_canonical(video_id)]
+        for tag_id in self.tags_dataset.tag_video_map:
+            self.canonical_tag_video_map[tag_id] = list(dict.fromkeys(
+                self.duplicate_clusters.get_canonical_video_id(video_id)
+                for video_id in self.tags_dataset.tag_video_map[tag_id]
+            ))
+
+    def get_duplicate_videos(self, youtube_video_id: str):
+        """
+        Returns the other videos collapsed into the same cluster as the given video
+        """
+        video_id = self.tags_dataset.video_glossary.get_video_id(youtube_video_id)
+        if video_id < 0:
+            return []
+
+        return [self.tags_dataset.video_glossary[member_video_id]
+                for member_video_id in self.duplicate_clusters.get_cluster(video_id)
+                if member_video_id != video_id]
+
+    def _get_video_recommendations_based_on_video_titles(self, input_queries: List[Tuple[ndarray, int]]):
         similarity_threshold = 0.7
         video_stats_list = {}
-        for input_doc in input_docs:
-            for video_id in self.video_titles_token_repo:
-                similarity_index = input_doc.similarity(self.video_titles_token_repo[video_id])
+        for input_vector, _ in input_queries:
+            for video_id in self.canonical_title_video_ids:
+                similarity_index = TokenizerHelper.get_cosine_similarity(
+                    self.video_titles_token_repo[video_id].vector,
+                    input_vector
+                )
                 if similarity_index >= similarity_threshold:
                     video_obj: Video = self.tags_dataset.video_glossary[video_id]
                     video_stats = {}
@@ -39,6 +133,7 @@ class RecommendationSystem:
                     video_stats["rating"] = video_obj.rating
                     video_stats["match_count"] = 1
                     video_stats["similarity"] = similarity_index
+                    video_stats["duplicate_count"] = len(self.duplicate_clusters.get_cluster(video_id)) - 1
                     video_stats_list[video_obj.id] = video_stats
 
         self._compute_scores_1(video_stats_list)
@@ -57,29 +152,35 @@ class RecommendationSystem:
             if max_match_count < video_stats_item["match_count"]:
                 max_match_count = video_stats_item["match_count"]
 
-        for video_id in video_stats_dict:
+        # boosts are swapped in as a whole by the aggregator, so take one reference for the whole computation
+        feedback_scores = np.zeros(len(video_stats_dict))
+        if self.feedback_aggregator:
+            video_ids = np.fromiter(video_stats_dict.keys(), dtype=int, count=len(video_stats_dict))
+            feedback_scores = self.feedback_aggregator.boosts[video_ids] * 10.0
+
+        for video_id, score_feedback in zip(video_stats_dict, feedback_scores):
             video_stats_item = video_stats_dict[video_id]
             score_similarity = video_stats_item["similarity"] * 80.0
             score_views = video_stats_item["num_views"] * 20.0 / max_views_count
             score_match_count = 0   # video_stats_item["match_count"] * 30.0 / max_match_count
-            video_stats_item["score"] = score_similarity + score_views + score_match_count
+            video_stats_item["score"] = score_similarity + score_views + score_match_count + score_feedback
 
     def _compute_scores_tags_matching(self, video_stats_dict: Dict[int, Dict]):
         return self._compute_scores_1(video_stats_dict)
 
-    def _get_video_recommendations_based_on_single_word_tags_matching(self, input_docs):
+    def _get_video_recommendations_based_on_single_word_tags_matching(self, input_queries: List[Tuple[ndarray, int]]):
         similarity_threshold = 0.7
         video_stats_list: Dict[int, Dict] = {}
 
-        for input_doc in input_docs:
+        for input_vector, _ in input_queries:
             for single_word_tag_id in self.tags_dataset.single_word_tag_glossary:
                 video_ids_matched_for_current_token = []
                 similarity_index = TokenizerHelper.get_cosine_similarity(
                     self.tags_dataset.tag_vector_map[single_word_tag_id],
-                    input_doc.vector
+                    input_vector
                 )
                 if similarity_index >= similarity_threshold:
-                    video_id_list = self.tags_dataset.tag_video_map[single_word_tag_id]
+                    video_id_list = self.canonical_tag_video_map[single_word_tag_id]
                     for video_id in video_id_list:
                         if video_id in video_ids_matched_for_current_token:
                             video_stats = video_stats_list[video_id]
@@ -105,17 +206,18 @@ class RecommendationSystem:
                             video_stats["rating"] = video_obj.rating
                             video_stats["match_count"] = 1
                             video_stats["similarity"] = similarity_index
+                            video_stats["duplicate_count"] = len(self.duplicate_clusters.get_cluster(video_id)) - 1
                             video_stats_list[video_obj.id] = video_stats
         self._compute_scores_tags_matching(video_stats_list)
         video_stats_list = dict(sorted(video_stats_list.items(), key=lambda item: item[1]["score"], reverse=True))
 
         return video_stats_list
 
-    def _get_video_recommendations_based_on_multi_word_tags_matching(self, input_docs):
+    def _get_video_recommendations_based_on_multi_word_tags_matching(self, input_queries: List[Tuple[ndarray, int]]):
         similarity_threshold = 0.7
         video_stats_list = {}
-        for input_doc in input_docs:
-            if len(input_doc) <= 1:
+        for input_vector, input_token_count in input_queries:
+            if input_token_count <= 1:
                 # in this function, we want to work with multi words only
                 # single words are taken care in another function
                 continue
@@ -124,10 +226,10 @@ class RecommendationSystem:
                 video_ids_matched_for_current_token = []
                 similarity_index = TokenizerHelper.get_cosine_similarity(
                     self.tags_dataset.tag_vector_map[multi_word_tag_id],
-                    input_doc.vector
+                    input_vector
                 )
                 if similarity_index >= similarity_threshold:
-                    video_id_list = self.tags_dataset.tag_video_map[multi_word_tag_id]
+                    video_id_list = self.canonical_tag_video_map[multi_word_tag_id]
 
                     for video_id in video_id_list:
                         if video_id in video_ids_matched_for_current_token:
@@ -154,6 +256,7 @@ class RecommendationSystem:
                             video_stats["rating"] = video_obj.rating
                             video_stats["match_count"] = 1
                             video_stats["similarity"] = similarity_index
+                            video_stats["duplicate_count"] = len(self.duplicate_clusters.get_cluster(video_id)) - 1
                             video_stats_list[video_obj.id] = video_stats
 
         self._compute_scores_1(video_stats_list)
@@ -163,10 +266,12 @@ class RecommendationSystem:
     def get_video_recommendations(self, input_text: str):
         input_text_list = input_text.split(",")
         final_recommendations = {}
-        input_docs = []
+        input_queries = []
         for keywords in input_text_list:
-            input_doc = self.tokenizer.get_document(keywords)
-            input_docs.append(input_doc)
+            query_tokens = self.tokenizer.get_query_tokens(keywords)
+            input_vector = self.tokenizer.get_query_vector(query_tokens)
+            if input_vector is not None:
+                input_queries.append((input_vector, len(query_tokens)))
 
         recommendation_functions = [
             self._get_video_recommendations_based_on_video_titles,
@@ -175,7 +280,7 @@ class RecommendationSystem:
         ]
 
         for fn in recommendation_functions:
-            video_recommendation_list = fn(input_docs)
+            video_recommendation_list = fn(input_queries)
             final_recommendations.update(video_recommendation_list)
             if len(final_recommendations) >= self.max_results:
                 final_recommendations = {
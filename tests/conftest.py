@@ -0,0 +1,8 @@
+import os
+import sys
+
+# the hashed backend has to be selected before universal is imported
+os.environ['EMBEDDING_BACKEND'] = 'hashed'
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
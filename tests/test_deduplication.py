@@ -0,0 +1,117 @@
+import csv
+import os
+
+import numpy as np
+import pytest
+
+from conftest import ROOT_DIR
+from deduplication import DuplicateClusters
+from recommendation import RecommendationSystem
+
+
+def _build(title_tokens, durations, num_views, noise: float = 1e-3):
+    random_state = np.random.RandomState(1)
+    base_vectors = random_state.standard_normal((len(title_tokens), 300))
+    # videos 0 and 1 share their vectors, everything else is unrelated
+    base_vectors[1] = base_vectors[0] + noise * random_state.standard_normal(300)
+
+    duplicate_clusters = DuplicateClusters()
+    duplicate_clusters.build(list(range(10, 10 + len(title_tokens))), base_vectors, base_vectors.copy(),
+                             title_tokens, durations, num_views)
+    return duplicate_clusters
+
+
+def test_reupload_is_collapsed_into_most_viewed():
+    title_tokens = [{"hiit", "workout", "20"}, {"hiit", "workout", "20"}, {"yoga"}, {"stretch"}]
+    duplicate_clusters = _build(title_tokens, [1200, 1210, 600, 300], [5, 50, 1, 1])
+
+    assert duplicate_clusters.get_canonical_video_id(10) == 11
+    assert sorted(duplicate_clusters.get_cluster(10)) == [10, 11]
+    assert duplicate_clusters.is_canonical(12)
+    assert duplicate_clusters.stats["clusters"] == 3
+
+
+def test_different_duration_is_not_collapsed():
+    title_tokens = [{"music", "mix", "2021"}, {"music", "mix", "2021"}, {"yoga"}, {"stretch"}]
+    duplicate_clusters = _build(title_tokens, [3600, 2400, 600, 300], [5, 50, 1, 1])
+
+    assert duplicate_clusters.get_cluster(10) == [10]
+    assert duplicate_clusters.stats["clusters"] == 4
+
+
+def test_different_title_tokens_are_not_collapsed():
+    title_tokens = [{"hiit", "workout", "20"}, {"hiit", "cardio", "30"}, {"yoga"}, {"stretch"}]
+    duplicate_clusters = _build(title_tokens, [1200, 1200, 600, 300], [5, 50, 1, 1])
+
+    assert duplicate_clusters.get_cluster(11) == [11]
+
+
+def test_bucket_larger_than_max_bucket_size_is_still_collapsed():
+    num_copies = DuplicateClusters().max_bucket_size + 10
+    random_state = np.random.RandomState(2)
+    vectors = random_state.standard_normal((num_copies + 5, 300))
+    vectors[:num_copies] = vectors[0]
+    title_tokens = [{"full", "body", "workout"}] * num_copies + [{"other", str(i)} for i in range(5)]
+    video_ids = list(range(len(title_tokens)))
+
+    duplicate_clusters = DuplicateClusters()
+    duplicate_clusters.build(video_ids, vectors, vectors.copy(), title_tokens,
+                             [900] * len(title_tokens), video_ids)
+
+    assert sorted(duplicate_clusters.get_cluster(0)) == list(range(num_copies))
+    assert duplicate_clusters.stats["split_buckets"] > 0
+    assert duplicate_clusters.stats["clusters"] == 6
+
+
+@pytest.fixture
+def recommendation_system_with_reupload(tmp_path):
+    """
+    data-short.csv with a less viewed re-upload of its first video appended
+    """
+    csv_file = tmp_path / "data-reupload.csv"
+    with open(os.path.join(ROOT_DIR, 'data', 'data-short.csv'), newline='', encoding='utf-8') as source_file:
+        rows = list(csv.reader(source_file))
+    reupload_row = list(rows[1])
+    reupload_row[0] = "reupload001"
+    reupload_row[4] = "1000"
+    rows.append(reupload_row)
+    with open(csv_file, 'w', newline='', encoding='utf-8') as target_file:
+        csv.writer(target_file).writerows(rows)
+
+    system = RecommendationSystem(str(csv_file), feedback_db_file=str(tmp_path / "feedback.db"))
+    yield system, rows[1][0], reupload_row[0]
+    system.close()
+
+
+def test_reupload_is_scored_only_through_its_representative(recommendation_system_with_reupload):
+    system, original_youtube_id, reupload_youtube_id = recommendation_system_with_reupload
+    video_glossary = system.tags_dataset.video_glossary
+    original_id = video_glossary.get_video_id(original_youtube_id)
+    reupload_id = video_glossary.get_video_id(reupload_youtube_id)
+
+    assert system.duplicate_clusters.get_canonical_video_id(reupload_id) == original_id
+    assert reupload_id not in system.canonical_title_video_ids
+    assert all(reupload_id not in video_ids for video_ids in system.canonical_tag_video_map.values())
+
+    recommendations = system.get_video_recommendations("abs workout")
+    urls = [r["url"] for r in recommendations.values()]
+    assert video_glossary[original_id].url in urls
+    assert video_glossary[reupload_id].url not in urls
+    assert recommendations[video_glossary[original_id].id]["duplicate_count"] == 1
+
+    assert system.get_duplicate_videos(original_youtube_id) == [video_glossary[reupload_id]]
+    assert system.get_duplicate_videos(reupload_youtube_id) == [video_glossary[original_id]]
+
+
+def test_feedback_on_reupload_boosts_representative(recommendation_system_with_reupload):
+    system, original_youtube_id, reupload_youtube_id = recommendation_system_with_reupload
+    original_video = system.tags_dataset.video_glossary[
+        system.tags_dataset.video_glossary.get_video_id(original_youtube_id)]
+
+    score_before = system.get_video_recommendations("abs workout")[original_video.id]["score"]
+    for _ in range(5):
+        system.record_feedback(reupload_youtube_id, "watch")
+    system.feedback_aggregator.aggregate()
+    score_after = system.get_video_recommendations("abs workout")[original_video.id]["score"]
+
+    assert score_after > score_before
@@ -0,0 +1,85 @@
+import sqlite3 as sql
+import time
+
+import numpy as np
+
+from feedback import FeedbackAggregator, FeedbackLog
+
+
+def _make_aggregator(tmp_path, batch_size: int = 50):
+    feedback_log = FeedbackLog(str(tmp_path / 'feedback.db'), batch_size=batch_size)
+    video_id_map = {"video_a": 0, "video_b": 1, "video_c": 2}
+    return feedback_log, FeedbackAggregator(feedback_log, video_id_map, len(video_id_map))
+
+
+def test_boost_depends_only_on_own_events(tmp_path):
+    feedback_log, aggregator = _make_aggregator(tmp_path)
+
+    feedback_log.record("video_a", "click")
+    aggregator.aggregate()
+    boost_a = aggregator.boosts[0]
+    assert 0 < boost_a < 1.0
+
+    for _ in range(20):
+        feedback_log.record("video_b", "watch")
+    aggregator.aggregate()
+    assert aggregator.boosts[0] == boost_a
+    assert aggregator.boosts[1] > boost_a
+    assert aggregator.boosts[2] == 0
+
+
+def test_boost_saturates(tmp_path):
+    feedback_log, aggregator = _make_aggregator(tmp_path)
+
+    for _ in range(1000):
+        feedback_log.record("video_c", "watch")
+    aggregator.aggregate()
+    assert aggregator.boosts[2] == 1.0
+
+
+def test_events_are_written_in_batches(tmp_path):
+    feedback_log, _ = _make_aggregator(tmp_path, batch_size=3)
+
+    feedback_log.record("video_a", "click")
+    feedback_log.record("video_a", "click")
+    assert len(feedback_log.read_events(0)) == 0
+
+    feedback_log.record("video_a", "click")
+    assert len(feedback_log.read_events(0)) == 3
+
+    feedback_log.record("video_b", "click")
+    feedback_log.flush()
+    assert len(feedback_log.read_events(0)) == 4
+
+
+def test_stop_ends_the_thread(tmp_path):
+    _, aggregator = _make_aggregator(tmp_path)
+    aggregator.start()
+    aggregator.stop()
+    assert not aggregator.is_alive()
+    assert np.all(aggregator.boosts == 0)
+
+
+def test_failed_aggregation_does_not_stop_the_thread(tmp_path):
+    feedback_log, aggregator = _make_aggregator(tmp_path)
+    aggregator.interval_seconds = 0.01
+    read_events = feedback_log.read_events
+    calls = []
+
+    def failing_once_read_events(after_event_id):
+        calls.append(after_event_id)
+        if len(calls) == 1:
+            raise sql.OperationalError("database is locked")
+        return read_events(after_event_id)
+
+    feedback_log.read_events = failing_once_read_events
+    feedback_log.record("video_a", "click")
+    aggregator.start()
+
+    deadline = time.time() + 5
+    while aggregator.boosts[0] == 0 and time.time() < deadline:
+        time.sleep(0.01)
+    aggregator.stop()
+
+    assert len(calls) > 1
+    assert aggregator.boosts[0] > 0
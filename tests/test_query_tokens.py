@@ -0,0 +1,113 @@
+import csv
+import os
+
+import numpy as np
+import pytest
+
+from conftest import ROOT_DIR
+from embedding import HashedBackend, SpacyBackend
+from tokenizer import Tokenizer
+
+
+def _read_titles():
+    with open(os.path.join(ROOT_DIR, 'data', 'data-short.csv'), newline='', encoding='utf-8') as csv_file:
+        csv_reader = csv.reader(csv_file)
+        next(csv_reader)
+        return [row[1] for row in csv_reader]
+
+
+QUERIES = [
+    "abs workout",
+    "bigger arms, chest",
+    "Abs workout for women",
+    "I am running twenty four miles",
+    "what's the best stretching routine for seniors?",
+    "zzzz qqqq",
+] + _read_titles()
+
+
+PARSER_CALLS = []
+
+
+def _make_blank_spacy_pipeline():
+    """
+    A small spaCy pipeline without a trained model: rule lemmas, vectors for a known vocabulary and
+    a stand-in "parser" that records when it runs. parse() and lemmatize() go through different spaCy calls here,
+    unlike the hashed backend.
+    """
+    spacy = pytest.importorskip("spacy")
+    from spacy.language import Language
+
+    if not Language.has_factory("test_rule_lemmatizer"):
+        @Language.component("test_rule_lemmatizer")
+        def rule_lemmatizer(doc):
+            for token in doc:
+                token.lemma_ = HashedBackend.get_lemma(token.lower_)
+            return doc
+
+        @Language.component("test_recording_parser")
+        def recording_parser(doc):
+            PARSER_CALLS.append(doc.text)
+            for token in doc:
+                token.dep_ = "dep"
+            return doc
+
+    nlp = spacy.blank("en")
+    nlp.add_pipe("test_rule_lemmatizer")
+    nlp.add_pipe("test_recording_parser", name="parser")
+
+    hashed_backend = HashedBackend()
+    for query in QUERIES:
+        for word in hashed_backend.make_doc(query.lower()):
+            lemma = HashedBackend.get_lemma(word.text)
+            for text in (word.text, lemma, lemma.replace('abs', 'ab'), ","):
+                if text not in ("zzzz", "qqqq"):
+                    nlp.vocab.set_vector(text, hashed_backend.get_word_vector(text))
+    return nlp
+
+
+@pytest.fixture(scope="module", params=["hashed", "spacy_blank", "spacy"])
+def tokenizer(request):
+    if request.param == "hashed":
+        return Tokenizer(HashedBackend.from_csv(os.path.join(ROOT_DIR, 'data', 'data.csv')))
+
+    if request.param == "spacy_blank":
+        return Tokenizer(SpacyBackend(nlp=_make_blank_spacy_pipeline()))
+
+    spacy = pytest.importorskip("spacy")
+    if not spacy.util.is_package("en_core_web_lg"):
+        pytest.skip("en_core_web_lg is not installed")
+    return Tokenizer(SpacyBackend())
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_query_tokens_match_document(tokenizer, query):
+    doc = tokenizer.get_document(query)
+    query_tokens = tokenizer.get_query_tokens(query)
+
+    if doc is None:
+        assert query_tokens == []
+        return
+    assert query_tokens == [token.text for token in doc]
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_query_vector_matches_document(tokenizer, query):
+    doc = tokenizer.get_document(query)
+    query_vector = tokenizer.get_query_vector(tokenizer.get_query_tokens(query))
+
+    if doc is None or np.linalg.norm(doc.vector) == 0:
+        assert query_vector is None
+        return
+    assert np.allclose(query_vector, doc.vector / np.linalg.norm(doc.vector), atol=1e-5)
+
+
+def test_query_tokens_skip_disabled_components():
+    tokenizer = Tokenizer(SpacyBackend(nlp=_make_blank_spacy_pipeline()))
+    PARSER_CALLS.clear()
+
+    assert tokenizer.get_query_tokens("abs workouts for women") == ["ab", "workout", "woman"]
+    assert PARSER_CALLS == []
+
+    tokenizer.get_document("abs workouts for women")
+    assert len(PARSER_CALLS) > 0
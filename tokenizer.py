@@ -4,8 +4,9 @@ from numpy.linalg import norm
 from typing import List
 from text2digits import text2digits
 
+from embedding import EmbeddingBackend
 from stop_words import stop_words
-from universal import nlp_global_object
+from universal import embedding_backend
 
 
 class TokenizerHelper:
@@ -68,8 +69,8 @@ class TextPreProcessor:
 
 
 class Tokenizer:
-    def __init__(self):
-        self.nlp = nlp_global_object
+    def __init__(self, backend: EmbeddingBackend = None):
+        self.backend = backend if backend else embedding_backend
 
     def _get_tokens(self, tags_text: str, lemmatize: bool, get_word_tokens_only: bool):
         word_tokens = []
@@ -77,13 +78,13 @@ class Tokenizer:
 
         pre_processor = TextPreProcessor()
         tags_text = pre_processor.work(tags_text)
-        doc = self.nlp(tags_text)
+        doc = self.backend.parse(tags_text)
 
         if lemmatize:
             lemmas = [token.lemma_ for token in doc]
             lemmas = [sub.replace('abs', 'ab') for sub in lemmas]
             lemmatized_text = " ".join(lemmas)
-            doc = self.nlp(lemmatized_text)
+            doc = self.backend.parse(lemmatized_text)
 
         for token in doc:
             if token.is_oov:
@@ -112,8 +113,54 @@ class Tokenizer:
     def get_tokens(self, tags_text: str, lemmatize: bool):
         return self._get_tokens(tags_text, lemmatize=lemmatize, get_word_tokens_only=False)
 
+    def get_query_tokens(self, tags_text: str):
+        """
+        Same tokens as the document returned by get_document(), but the pipeline runs only once with the
+        components that are not needed for lemmas left out. The lemmatized text is re-split with the
+        tokenizer alone, which is all the second and third pipeline runs in get_document() contribute.
+        """
+        pre_processor = TextPreProcessor()
+        tags_text = pre_processor.work(tags_text)
+        doc = self.backend.lemmatize(tags_text)
+
+        lemmas = [token.lemma_ for token in doc]
+        lemmas = [sub.replace('abs', 'ab') for sub in lemmas]
+        lemmatized_text = " ".join(lemmas)
+
+        word_tokens = []
+        for token in self.backend.make_doc(lemmatized_text):
+            if token.is_oov:
+                continue
+
+            if len(token.text) <= 1 and not token.like_num and token.text != ',':
+                continue
+
+            if token.text in stop_words:
+                continue
+
+            word_tokens.append(token.text)
+
+        if len(word_tokens) == 0:
+            return []
+        return [token.text for token in self.backend.make_doc(" ".join(word_tokens))]
+
+    def get_query_vector(self, query_tokens: List[str]):
+        """
+        Unit length average of the token vectors, looked up directly in the backend's vector table.
+        Returns None if there is nothing to compare against.
+        """
+        if len(query_tokens) == 0:
+            return None
+
+        # tokens without a vector count as zero vectors, the same way Doc.vector averages them
+        vec = self.backend.get_vectors(query_tokens).mean(axis=0)
+        vec_norm = norm(vec)
+        if vec_norm == 0:
+            return None
+        return vec / vec_norm
+
     def get_document(self, tags_text: str):
         word_tokens = self.get_lemmatized_word_tokens(tags_text)
         if len(word_tokens) == 0:
             return None
-        return self.nlp(" ".join(word_tokens))
+        return self.backend.parse(" ".join(word_tokens))
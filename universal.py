@@ -1,4 +1,7 @@
 # global objects are declared here
-import spacy
+import os
 
-nlp_global_object = spacy.load('en_core_web_lg')
+from embedding import get_embedding_backend
+
+# 'spacy' needs the en_core_web_lg model, 'hashed' is a small deterministic backend for tests and benchmarks
+embedding_backend = get_embedding_backend(os.environ.get('EMBEDDING_BACKEND', 'spacy'))